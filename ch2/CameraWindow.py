@@ -27,6 +27,10 @@ cameraCapture = cv2.VideoCapture(0)
 if not cameraCapture.isOpened():
     raise IOError("Cannot open webcam")
 
+# Ask the driver to queue at most one frame so the preview always shows the latest frame
+# instead of lagging behind the camera. Backends that do not support this ignore it.
+cameraCapture.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+
 # Create an OpenCV window to display the video frames.
 cv2.namedWindow('MyWindow')
 
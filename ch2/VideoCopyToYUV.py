@@ -25,16 +25,17 @@ videoWriter = cv2.VideoWriter(
     'MyOutputVid.avi', cv2.VideoWriter_fourcc('I', '4', '2', '0'),
     fps, size)
 
-# Read the first frame from the video.
-success, frame = videoCapture.read()
-
 # Loop over all frames in the video.
-# The loop continues as long as `videoCapture.read()` successfully reads a frame.
-while success:
+# The loop continues as long as `videoCapture.grab()` successfully advances to a frame.
+# `retrieve()` then decodes that frame into the buffer from the previous iteration,
+# so the same frame buffer is reused instead of allocating a new one per frame.
+frame = None
+while videoCapture.grab():
+    success, frame = videoCapture.retrieve(frame)
+    if not success:
+        break
     # Write the current frame to the output video file.
     videoWriter.write(frame)
-    # Read the next frame from the video.
-    success, frame = videoCapture.read()
 
 # Clean up: release the VideoCapture and VideoWriter objects to free their resources.
 videoCapture.release()
@@ -1,4 +1,6 @@
 import cv2 
+import numpy as np
+import os
 import filters
 from managers import WindowManager, CaptureManager 
 
@@ -15,26 +17,88 @@ class Cameo(object):
         Initialize the Cameo application with the necessary managers for window and capture management.
         """
         self._windowManager = WindowManager('Cameo', self.onKeypress)
-        self._captureManager = CaptureManager(cv2.VideoCapture(0), self._windowManager, True)
+        # Capture on a background thread so grabbing and decoding overlap with filtering and display.
+        self._captureManager = CaptureManager(cv2.VideoCapture(0), self._windowManager, True,
+                                              shouldCaptureAsync = True)
+        # Detect edges at half resolution; the strokes are slightly softer but the filter is about 4x cheaper.
+        self._strokeEdgesFilter = filters.StrokeEdgesFilter(shouldDownsample = True)
         self._curveFilter = filters.BGRPortraCurveFilter()
+        self._lastRawFrame = None       # Copy of the last frame that went through the filters
+        self._lastFilteredFrame = None  # Copy of the filtered result for that frame
         
     def run(self) -> None:
         """
         Start the main loop of the application.
 
-        This method continuously captures frames from the video source, processes them (currently no
-        processing is done, but this is where you would insert frame filtering or detection logic),
-        and handles user inputs until the window is closed.
+        This method continuously captures frames from the video source, processes them with the edge stroking
+        and curve filters (reusing the previous result when the camera repeats a frame), and handles user
+        inputs until the window is closed.
         """
         self._windowManager.createWindow()
         while self._windowManager.isWindowCreated:
             self._captureManager.enterFrame()   # Start capturing a frame
             frame = self._captureManager.frame  # Retrieve the current frame
             if frame is not None:
-                filters.strokeEdges(src = frame, dst = frame)
-                self._curveFilter.apply(src = frame, dst = frame)
+                if self._isRepeatedFrame(frame):
+                    # The camera delivered the same image again, so reuse the last filtered result.
+                    np.copyto(frame, self._lastFilteredFrame)
+                else:
+                    self._lastRawFrame = self._copyInto(self._lastRawFrame, frame)
+                    self._applyFilters(frame)
+                    self._lastFilteredFrame = self._copyInto(self._lastFilteredFrame, frame)
             self._captureManager.exitFrame()    # Finish capturing the frame and handle any outputs
             self._windowManager.processEvents() # Handle any window events, such as key presses
+        self._captureManager.release()          # Finish writing any pending snapshot or video
+            
+    def _applyFilters(self, frame: np.ndarray) -> None:
+        """
+        Apply the edge stroking and curve filters to a frame in place.
+
+        Args:
+            frame (np.ndarray): The BGR frame to filter.
+        """
+        if cv2.ocl.useOpenCL():
+            # Run the filters through OpenCV's transparent API so they execute on the OpenCL device,
+            # then copy the result back into the frame that will be displayed and recorded.
+            deviceFrame = cv2.UMat(frame)
+            self._strokeEdgesFilter.apply(src = deviceFrame, dst = deviceFrame, size = frame.shape[1::-1])
+            self._curveFilter.apply(src = deviceFrame, dst = deviceFrame)
+            frame[:] = deviceFrame.get()
+        else:
+            self._strokeEdgesFilter.apply(src = frame, dst = frame)
+            self._curveFilter.apply(src = frame, dst = frame)
+            
+    def _isRepeatedFrame(self, frame: np.ndarray) -> bool:
+        """
+        Check whether a frame is pixel-for-pixel identical to the last frame that was filtered.
+
+        Args:
+            frame (np.ndarray): The newly captured frame.
+
+        Returns:
+            bool: True if the frame matches the last filtered frame, otherwise False.
+        """
+        if self._lastRawFrame is None or self._lastRawFrame.shape != frame.shape:
+            return False
+        # A single SIMD pass over both frames is far cheaper than the median blur and Laplacian it can skip.
+        return cv2.norm(frame, self._lastRawFrame, cv2.NORM_INF) == 0
+    
+    @staticmethod
+    def _copyInto(buffer: np.ndarray, frame: np.ndarray) -> np.ndarray:
+        """
+        Copy a frame into a reusable buffer, allocating a new buffer only if the existing one doesn't fit.
+
+        Args:
+            buffer (np.ndarray): The buffer to reuse, or None.
+            frame (np.ndarray): The frame to copy.
+
+        Returns:
+            np.ndarray: The buffer holding the copy.
+        """
+        if buffer is None or buffer.shape != frame.shape:
+            return frame.copy()
+        np.copyto(buffer, frame)
+        return buffer
             
     def onKeypress(self, keycode: int) -> None:
         """
@@ -59,4 +123,7 @@ class Cameo(object):
             self._windowManager.destroyWindow()  # Close the application window
             
 if __name__ == "__main__":
+    # Make sure OpenCV uses its SIMD-optimized kernels and spreads work over every CPU core.
+    cv2.setUseOptimized(True)
+    cv2.setNumThreads(os.cpu_count() or 1)
     Cameo().run()   # Start the application
\ No newline at end of file
@@ -1,7 +1,27 @@
+import concurrent.futures
 import cv2 
 import numpy as np
+import queue
+import threading
 import time 
 
+def _putLatest(frameQueue: queue.Queue, frame) -> None:
+    """
+    Put a frame into a bounded queue without blocking, dropping the oldest queued frame if the queue is full.
+
+    Args:
+        frameQueue (queue.Queue): The bounded queue. This thread must be its only producer.
+        frame (np.ndarray): The frame to queue.
+    """
+    try:
+        frameQueue.put_nowait(frame)
+    except queue.Full:
+        try:
+            frameQueue.get_nowait()
+        except queue.Empty:
+            pass    # The consumer emptied the queue in the meantime.
+        frameQueue.put_nowait(frame)
+
 class CaptureManager(object):
     """
     Manage the capture process from a video source, allowing for frame capture, preview management, and recording.
@@ -12,42 +32,87 @@ class CaptureManager(object):
     Attributes:
         previewWindowManager (Any): Optional manager for any preview windows.
         shouldMirrorPreview (bool): Flag to indicate if the preview should be mirrored.
+        shouldDropStaleFrames (bool): Flag to indicate if buffered frames should be skipped when entering a frame.
+        staleFrameTime (float): A grab that returns within this many seconds is assumed to have returned a
+            buffered, possibly stale frame.
         _capture (cv2.VideoCapture): The video capture object.
         _channel (int): The channel of the video capture device.
         _enteredFrame (bool): Flag to check if the frame has been entered.
         _frame (np.ndarray): The current video frame.
+        _mirroredFrame (np.ndarray): Reusable buffer for the mirrored preview frame.
+        _frameRing (list): Reusable buffers that synchronously retrieved frames are decoded into.
+        _frameRingIndex (int): Index of the ring buffer the next frame is decoded into.
         _imageFilename (str): Filename for saving snapshots.
+        _imageExecutor (concurrent.futures.ThreadPoolExecutor): Worker that encodes and saves snapshots.
         _videoFilename (str): Filename for saving video.
         _videoEncoding (tuple): Video encoding format.
         _videoWriter (cv2.VideoWriter): Video writer object for recording.
-        _startTime (float): Start time of the recording.  
-        _framesElapsed (int): Count of frames that have elapsed.
-        _fpsEstimate (float) Estimated frame per second in the video.
+        _videoQueue (queue.Queue): Frames waiting to be encoded by the video writer thread.
+        _videoThread (threading.Thread): Background thread that encodes and writes recorded frames.
+        _prevTime (float): perf_counter time at which the previous frame was exited.
+        _fpsEstimate (float) Estimated frame per second in the video, as a moving average over recent frames.
+        _captureFps (float): The capture's FPS property, queried after the first successful grab, or None.
+        _captureQueue (queue.Queue): Frames decoded by the background capture thread, or None when capturing synchronously.
+        _captureThread (threading.Thread): Background thread that grabs and decodes frames, or None.
+        _stopCapture (threading.Event): Set by `release` to stop the background capture thread.
     """
     def __init__(self, capture: cv2.VideoCapture, previewWindowManager = None,
-                 shouldMirrorPreview: bool = False):
+                 shouldMirrorPreview: bool = False, shouldCaptureAsync: bool = False,
+                 shouldDropStaleFrames: bool = False, staleFrameTime: float = 0.005):
         """
         Initializes the CaptureManagers object with the video capture device, optional preview window manager,
         and a flag to determine if the preview should be mirrored.
 
+        For camera sources, the driver is asked to queue at most one frame so the preview does not lag behind
+        and no stale frames are decoded. File sources, and backends without this property, ignore the request.
+
         Args:
             capture (cv2.VideoCapture): The video capture device.
             previewWindowManager (Any, optional): Manger for any preview windows. Defaults to None.
             shouldMirrorPreview (bool, optional): If set to True, the preview display will be mirrored. Defaults to False.
+            shouldCaptureAsync (bool, optional): If set to True, frames are grabbed and decoded on a background thread
+                so capture overlaps with frame processing and display. Defaults to False.
+            shouldDropStaleFrames (bool, optional): If set to True, `enterFrame` keeps grabbing while grabs return
+                immediately, so frames queued by camera drivers that ignore the buffer size are skipped. Only use
+                this with live cameras, since every grab from a file returns immediately. It has no effect when
+                capturing asynchronously. Defaults to False.
+            staleFrameTime (float, optional): Grabs faster than this many seconds count as stale. Keep it well
+                below the camera's frame period. Defaults to 0.005.
         """
         self.previewWindowManager = previewWindowManager 
         self.shouldMirrorPreview = shouldMirrorPreview
+        self.shouldDropStaleFrames = shouldDropStaleFrames
+        self.staleFrameTime = staleFrameTime
         self._capture = capture 
+        self._captureFps = None 
+        if capture is not None:
+            try:
+                capture.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+            except cv2.error:
+                pass    # Some backends reject the property instead of ignoring it.
         self._channel = 0
         self._enteredFrame = False 
         self._frame = None
+        self._mirroredFrame = None 
+        self._frameRing = None 
+        self._frameRingIndex = 0
         self._imageFilename = None 
+        self._imageExecutor = None 
         self._videoFilename = None 
         self._videoEncoding = None 
         self._videoWriter = None 
-        self._startTime = None 
-        self._framesElapsed = 0
+        self._videoQueue = None 
+        self._videoThread = None 
+        self._prevTime = None 
         self._fpsEstimate = None 
+        self._captureQueue = None 
+        self._captureThread = None 
+        self._stopCapture = threading.Event()
+        if shouldCaptureAsync and capture is not None:
+            # Keep at most two decoded frames in flight; older ones are dropped so latency stays bounded.
+            self._captureQueue = queue.Queue(maxsize = 2)
+            self._captureThread = threading.Thread(target = self._captureFrames, daemon = True)
+            self._captureThread.start()
         
     @property 
     def channel(self) -> int:
@@ -76,11 +141,29 @@ class CaptureManager(object):
         """
         Retrieves the current frame from the capture device.  
         
+        Frames are decoded into a small ring of reused buffers, so a frame's contents are only valid
+        until a few more frames have been retrieved. Copy the frame to keep it longer. While a snapshot
+        or recording is pending, each frame is decoded into a new array instead, which the background
+        writers can keep without a copy.
+        
         Returns:
             np.ndarray: The current video frame.
         """
-        if self._enteredFrame and self._frame is None:
-            _, self._frame = self._capture.retrieve(self._frame, self.channel)
+        if self._enteredFrame and self._frame is None and self._captureQueue is None:
+            if self.isWritingImage or self.isWritingVideo:
+                success, frame = self._capture.retrieve(None, self.channel)
+                self._frame = frame if success else None
+                return self._frame 
+            buffer = None if self._frameRing is None else self._frameRing[self._frameRingIndex]
+            success, frame = self._capture.retrieve(buffer, self.channel)
+            # A failed retrieve hands back the buffer with stale or uninitialized contents, so drop it.
+            self._frame = frame if success else None
+            if success:
+                if frame is not buffer:
+                    # First frame, or the frame size changed: build the ring around the new frame.
+                    self._frameRing = [frame] + [np.empty_like(frame) for _ in range(2)]
+                    self._frameRingIndex = 0
+                self._frameRingIndex = (self._frameRingIndex + 1) % len(self._frameRing)
             
         return self._frame 
     
@@ -115,9 +198,25 @@ class CaptureManager(object):
         # Assert that we did not already enter a frame without exiting.
         assert not self._enteredFrame, \
             'previous enterFrame() had no matching exitFrame()'
-        # Attempt to grab the next frame if the capture device is initialized.
-        if self._capture is not None:
+        # Take the next decoded frame from the capture thread if capturing asynchronously.
+        if self._captureQueue is not None:
+            self._frame = self._captureQueue.get()
+            if self._frame is None:
+                # The capture thread has stopped; leave the end marker for later calls.
+                self._captureQueue.put(None)
+            self._enteredFrame = self._frame is not None
+        # Otherwise attempt to grab the next frame if the capture device is initialized.
+        elif self._capture is not None:
+            startTime = time.perf_counter()
             self._enteredFrame = self._capture.grab()
+            # A grab that returns at once delivered a frame the driver had already queued, which may be old.
+            # Keep grabbing until a grab has to wait for the camera, which means its frame is fresh.
+            while self._enteredFrame and self.shouldDropStaleFrames and \
+                    time.perf_counter() - startTime < self.staleFrameTime:
+                startTime = time.perf_counter()
+                self._enteredFrame = self._capture.grab()
+            if self._enteredFrame:
+                self._cacheCaptureFps()
             
     def exitFrame(self):
         """
@@ -126,32 +225,48 @@ class CaptureManager(object):
         This method draws the frame to the window if a window manager is present, writes the frame
         to an image file if a snapshot is requested, records the frame to a video if recording is active,
         and then releases the frame to process the next one.  It also calculates and updates the frame
-        rate estimate.
+        rate estimate.  If there is no preview, snapshot or recording, the grabbed frame is never decoded.
         """
+        # If nothing will display or save the frame, release it without decoding it. A frame that was
+        # already retrieved through the 'frame' property is simply dropped.
+        if self.previewWindowManager is None and not self.isWritingImage and not self.isWritingVideo:
+            self._frame = None 
+            self._enteredFrame = False 
+            return 
+        
         # Check if the frame was grabbed successfully. If not, reset the entered frame flag and return.
         if self.frame is None:
             self._enteredFrame = False 
             return 
         
-        # Calculate and update the frame rate estimate.
-        if self._framesElapsed == 0:
-            self._startTime = time.time()
-        else:
-            timeElapsed = time.time() - self._startTime 
-            self._fpsEstimate = self._framesElapsed / timeElapsed
-        self._framesElapsed += 1
+        # Update the frame rate estimate with an exponential moving average of the frame intervals,
+        # so it follows the current rate instead of averaging over everything since startup.
+        now = time.perf_counter()
+        if self._prevTime is not None:
+            fps = 1.0 / max(now - self._prevTime, 1e-6)
+            if self._fpsEstimate is None:
+                self._fpsEstimate = fps 
+            else:
+                self._fpsEstimate = 0.9 * self._fpsEstimate + 0.1 * fps
+        self._prevTime = now 
         
         # Display the frame in the window, mirroring it if necessary.
         if self.previewWindowManager is not None:
             if self.shouldMirrorPreview:
-                mirroredFrame = np.fliplr(self._frame)
-                self.previewWindowManager.show(mirroredFrame)
+                # Flip into a reusable contiguous buffer; a np.fliplr view would be copied again by imshow.
+                if self._mirroredFrame is None or self._mirroredFrame.shape != self._frame.shape:
+                    self._mirroredFrame = np.empty_like(self._frame)
+                cv2.flip(self._frame, 1, self._mirroredFrame)
+                self.previewWindowManager.show(self._mirroredFrame)
             else:
                 self.previewWindowManager.show(self._frame)
                 
-        # Save the frame as an image file if requested.
+        # Save the frame as an image file if requested. Encoding happens on a worker thread so the
+        # snapshot does not stall this frame.
         if self.isWritingImage:
-            cv2.imwrite(self._imageFilename, self._frame)
+            if self._imageExecutor is None:
+                self._imageExecutor = concurrent.futures.ThreadPoolExecutor(max_workers = 1)
+            self._imageExecutor.submit(cv2.imwrite, self._imageFilename, self._detachedFrame())
             self._imageFilename = None 
             
         # Record the frame to a video file if recording is active.
@@ -161,6 +276,33 @@ class CaptureManager(object):
         self._frame = None 
         self._enteredFrame = False  
         
+    def release(self) -> None:
+        """
+        Finish all pending output, shut down the background threads and release the capture device.
+
+        Stops any video recording, waits until queued snapshots have been saved and stops the capture thread.
+        Call this once the capture loop has ended.
+        """
+        if self._captureThread is not None:
+            # The capture thread would otherwise stay blocked in a native grab, which aborts interpreter shutdown.
+            self._stopCapture.set()
+            while self._captureThread.is_alive():
+                # Empty the queue so that a put on the capture thread cannot block it.
+                try:
+                    self._captureQueue.get_nowait()
+                except queue.Empty:
+                    pass
+                self._captureThread.join(0.01)
+            self._captureThread = None 
+            _putLatest(self._captureQueue, None)    # Later calls to enterFrame see the end of the stream.
+        if self._capture is not None:
+            self._capture.release()
+        if self.isWritingVideo:
+            self.stopWritingVideo()
+        if self._imageExecutor is not None:
+            self._imageExecutor.shutdown(wait = True)
+            self._imageExecutor = None 
+        
     def writeImage(self, filename: str) -> None:
         """
         Write the next exited frame to an image file.
@@ -174,6 +316,9 @@ class CaptureManager(object):
         """
         Start writing exited frames to a video file.
 
+        Frames are encoded on a background thread. Up to 8 frames can wait for the encoder, which absorbs brief
+        stalls; if it falls further behind, `exitFrame` blocks until there is room, so no frame is ever dropped.
+
         Args:
             filename (str): Filename of the video.
             encoding (_type_, optional): _description_. Defaults to cv2.VideoWriter_fourcc('M','J','P','G').
@@ -184,37 +329,104 @@ class CaptureManager(object):
     def stopWritingVideo(self) -> None:
         """
         Stop writing exited frames to a video file.
+
+        Blocks until the video writer thread has written every queued frame and released the file.
         """
+        if self._videoThread is not None:
+            self._videoQueue.put(None)
+            self._videoThread.join()
         self._videoFilename = None 
         self._videoEncoding = None 
         self._videoWriter = None 
+        self._videoQueue = None 
+        self._videoThread = None 
         
     def _writeVideoFrame(self):
         """
         Writes the current frame to the video file, initializing the video writer if necessary.
 
         This method checks if the video writer has been initialized and if not, initializes it with
-        the estimated frame rate if the actual frame rate is not known. It skips writing the initial frames
-        if the frame rate is still being estimated to ensure the stability of the video output.
+        the estimated frame rate if the actual frame rate is not known. It skips writing frames until
+        an estimate is available, which takes two frames.
         """
         if not self.isWritingVideo:
             return 
         if self._videoWriter is None:
-            fps = self._capture.get(cv2.CAP_PROP_FPS)
+            fps = self._captureFps
             if fps <= 0.0:
                 # The capture's FPS is unknown so use an estimate.
-                if self._framesElapsed < 20:
-                    # Wait until more frames elapse so that the 
-                    # estimate is more stable.
+                if self._fpsEstimate is None:
+                    # Wait until enough frames elapse to estimate it.
                     return 
-                else:
-                    fps = self._fpsEstimate
-            size = (int(self._capture.get(cv2.CAP_PROP_FRAME_WIDTH)),
-                    int(self._capture.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+                fps = self._fpsEstimate
+            # Size the video from the frame itself, which stays exact if the capture's frame size changes.
             self._videoWriter = cv2.VideoWriter(
-                self._videoFilename, self._videoEncoding, fps, size
+                self._videoFilename, self._videoEncoding, fps, self._frame.shape[1::-1]
             )
-        self._videoWriter.write(self._frame)
+            # Encode on a separate thread so a slow write does not hold up the next capture.
+            self._videoQueue = queue.Queue(maxsize = 8)
+            self._videoThread = threading.Thread(target = self._writeVideoFrames,
+                                                 args = (self._videoWriter, self._videoQueue), daemon = True)
+            self._videoThread.start()
+        # If the writer falls behind, block until it catches up so that every frame is recorded.
+        self._videoQueue.put(self._detachedFrame())
+        
+    def _detachedFrame(self) -> np.ndarray:
+        """
+        Get the current frame in a form that a background writer can keep after the frame is exited.
+
+        Frames decoded into the reusable ring are copied, since the ring will overwrite them. Other frames, such
+        as those from the capture thread or retrieved while writing, are separate arrays already and are returned
+        as they are.
+
+        Returns:
+            np.ndarray: The current frame, or a copy of it.
+        """
+        if self._frameRing is not None and any(self._frame is buffer for buffer in self._frameRing):
+            return self._frame.copy()
+        return self._frame
+        
+    @staticmethod
+    def _writeVideoFrames(videoWriter: cv2.VideoWriter, videoQueue: queue.Queue) -> None:
+        """
+        Write queued frames on the video writer thread until a None entry is received, then release the writer.
+
+        Args:
+            videoWriter (cv2.VideoWriter): The video writer to encode frames with.
+            videoQueue (queue.Queue): The queue of frames to write.
+        """
+        frame = videoQueue.get()
+        while frame is not None:
+            videoWriter.write(frame)
+            frame = videoQueue.get()
+        videoWriter.release()
+        
+    def _cacheCaptureFps(self) -> None:
+        """
+        Query the capture's FPS after the first successful grab and keep it.
+
+        Property queries go through the backend and can reach the device itself, so the FPS is queried once
+        rather than each time a video writer is created. In asynchronous mode this runs on the capture thread,
+        which keeps the query from racing its grabs.
+        """
+        if self._captureFps is not None:
+            return 
+        self._captureFps = self._capture.get(cv2.CAP_PROP_FPS)
+
+    def _captureFrames(self) -> None:
+        """
+        Grab and decode frames on the background capture thread until the capture device stops delivering them
+        or `release` is called.
+
+        Each decoded frame is queued for `enterFrame`. When the queue is full the oldest frame is dropped, so the
+        consumer always works on a recent frame. A None entry marks the end of the stream.
+        """
+        while not self._stopCapture.is_set() and self._capture.grab():
+            self._cacheCaptureFps()
+            success, frame = self._capture.retrieve(None, self.channel)
+            if success:
+                _putLatest(self._captureQueue, frame)
+        self._captureQueue.put(None)
         
 class WindowManager(object):
     """
@@ -226,8 +438,9 @@ class WindowManager(object):
         keypressCallback (Callable[int], None], optional): A function to call when a key event occurs.
             This function should take a single integer parameter (the keycode of the pressed key).
         mouseCallback (Callable[[int, int, int, int, Any], None], optional): A function to call when a mouse event occurs.
+        yieldMs (int): How many milliseconds `processEvents` waits for a key. If 0, it does not wait at all.
     """
-    def __init__(self, windowName: str, keypressCallback = None, mouseCallback = None):
+    def __init__(self, windowName: str, keypressCallback = None, mouseCallback = None, yieldMs: int = 0):
         """
         Initializes the WindowManager with a name and an optional key press callback function
 
@@ -236,9 +449,12 @@ class WindowManager(object):
             keypressCallback (Callable[[int], None], optional): A callback function that is called on a key press. 
                 If None, no callback is executed.  Defaults to None.
             mouseCallback (Callable[[int, int, int, int, Any], None], optional): A callback function that is called on mouse events.
+            yieldMs (int, optional): If nonzero, `processEvents` waits this many milliseconds for a key, which throttles
+                the main loop. Defaults to 0.
         """
         self.keypressCallback = keypressCallback
         self.mouseCallback = mouseCallback
+        self.yieldMs = yieldMs
         self._windowName = windowName 
         self._isWindowCreated = False 
         
@@ -289,10 +505,16 @@ class WindowManager(object):
         """
         Processes any events, such as keyboard inputs, that occur in the window.
         
-        If a keypress callback is set, it will call this function with the keycode of any key that is pressed.
-        The method handles a single keypress event per invocation.
+        If a keypress callback is set, it will call this function with the keycode of every pending key press.
+        Unless `yieldMs` is set, the method does not wait for a key. HighGUI still handles window events such as
+        redraws inside `cv2.pollKey`, so the window stays responsive.
         """
-        keycode = cv2.waitKey(1) # Wait for 1 ms for a key press
-        if self.keypressCallback is not None and keycode != -1:
-            # Call the callback function if a key was pressed and a callback exists.
-            self.keypressCallback(keycode)
\ No newline at end of file
+        if self.yieldMs > 0:
+            keycode = cv2.waitKey(self.yieldMs)    # Wait for a key press, throttling the caller.
+        else:
+            keycode = cv2.pollKey()     # Check for a key press without waiting.
+        while keycode != -1:
+            if self.keypressCallback is not None:
+                # Call the callback function if a key was pressed and a callback exists.
+                self.keypressCallback(keycode)
+            keycode = cv2.pollKey()
\ No newline at end of file
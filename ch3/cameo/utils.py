@@ -2,12 +2,29 @@ import cv2
 import numpy as np
 import scipy.interpolate 
 
-def createCurveFunc(points: list) -> callable:
+class _LutFunc(object):
+    """
+    A function defined by a table of its values at the integers 0 to len(table) - 1.
+
+    Integer inputs read the table directly and fractional inputs, such as the output of another curve in a
+    composite, are linearly interpolated between neighbouring entries. Inputs are clamped to the table.
+    """
+    def __init__(self, table: np.ndarray):
+        self.table = table
+        self._xs = np.arange(len(table))
+
+    def __call__(self, x):
+        return np.interp(x, self._xs, self.table)
+
+def createCurveFunc(points: list, domain: int = None) -> callable:
     """
     Create a function from a list of points suitable for interpolation.
 
     Args:
         points (list): List of tuples (x, y) representing points.
+        domain (int, optional): If given, the curve is only needed at the integers 0 to domain - 1. It is
+            evaluated there once and the returned function looks values up in that table instead of
+            interpolating on every call. Defaults to None, which returns the continuous interpolation.
         
     Returns:
         callable: An interpolated function derived from the points.
@@ -25,28 +42,32 @@ def createCurveFunc(points: list) -> callable:
     else:
         kind = 'cubic'
         
-    return scipy.interpolate.interp1d(xs, ys, kind, bounds_error = False)
+    func = scipy.interpolate.interp1d(xs, ys, kind, bounds_error = False)
+    if domain is None:
+        return func 
+    return _LutFunc(func(np.arange(domain)))
 
-def createLookupArray(func: callable, length:int = 256) -> np.ndarray:
+def createLookupArray(func: callable, length:int = 256, dtype = np.uint8) -> np.ndarray:
     """
     Create a lookup array for a function over the range of integer inputs.
 
     Args:
-        func (callable): Function to be applied.
+        func (callable): Function to be applied. It is called once with a NumPy array of all the inputs and
+            must return an array of the same shape, so scalar-only functions such as `min` need `np.minimum`.
         length (int): Length of the lookup array. Defaults to 256
+        dtype (type): Integer type of the lookup values, matching the image type the array is applied to.
+            Clamped function values are truncated to this type. Defaults to np.uint8.
 
     Returns:
         np.ndarray: Array containing the lookup values
     """
     if func is None:
         return None 
-    lookupArray = np.empty(length)
-    i = 0
-    while i < length:
-        func_i = func(i)
-        lookupArray[i] = min(max(0, func_i), length - 1)
-        i += 1
-    return lookupArray
+    # Evaluate the function over the whole domain in one vectorized call and clamp the results.
+    # Points outside the function's range (NaN) map to 0.
+    lookupArray = np.clip(func(np.arange(length)), 0, length - 1)
+    np.nan_to_num(lookupArray, copy = False, nan = 0)
+    return lookupArray.astype(dtype)
 
 def applyLookupArray(lookupArray: np.ndarray, src: np.ndarray, dst: np.ndarray) -> None:
     """
@@ -59,7 +80,15 @@ def applyLookupArray(lookupArray: np.ndarray, src: np.ndarray, dst: np.ndarray)
     """
     if lookupArray is None:
         return 
-    dst[:] = lookupArray[src]
+    if src.dtype == np.uint8 and lookupArray.shape == (256,) and lookupArray.dtype == dst.dtype and \
+            dst.flags['C_CONTIGUOUS']:
+        # OpenCV's vectorized lookup handles 8-bit images with a 256-entry table, writing directly into dst.
+        # It cannot write into a strided view such as a single channel plane, which np.take handles.
+        cv2.LUT(src, lookupArray, dst)
+    else:
+        # Gather straight into dst rather than building a temporary image and copying it over. Like plain
+        # indexing, this raises an IndexError for image values outside the table instead of clamping them.
+        np.take(lookupArray, src, out = dst)
 
 def createCompositeFunc(func0: callable, func1: callable) -> callable:
     """
@@ -19,7 +19,8 @@ img = cv2.imread('statue_small.jpg', cv2.IMREAD_GRAYSCALE)
 
 # Use the Canny edge detector to find edges in the image
 # threshold1 and threshold2 are the lower and upper thresholds for the hysteresis process
-cv2.imwrite('canny.jpg', cv2.Canny(image=img, threshold1=200, threshold2=300))
+# Passing a UMat lets OpenCV's transparent API run Canny on an OpenCL device when one is available
+cv2.imwrite('canny.jpg', cv2.Canny(image=cv2.UMat(img), threshold1=200, threshold2=300))
 
 # Display the Canny edge image
 cv2.imshow("canny", cv2.imread("canny.jpg"))
@@ -3,8 +3,9 @@ import numpy as np
 
 img = cv2.pyrDown(cv2.imread(filename = "hammer.jpg", flags = cv2.IMREAD_UNCHANGED))
 
-ret, thresh = cv2.threshold(src = cv2.cvtColor(src = img, code = cv2.COLOR_BGR2GRAY), thresh = 127, maxval = 255, 
-                            type = cv2.THRESH_BINARY)
+# The grayscale image is only needed as threshold input, so threshold it in place
+gray = cv2.cvtColor(src = img, code = cv2.COLOR_BGR2GRAY)
+ret, thresh = cv2.threshold(src = gray, thresh = 127, maxval = 255, type = cv2.THRESH_BINARY, dst = gray)
 contours, hierarchy = cv2.findContours(image = thresh, mode = cv2.RETR_EXTERNAL,
                                        method = cv2.CHAIN_APPROX_SIMPLE)
 
@@ -13,27 +14,34 @@ if contours:
 else:
     print("No contours found")
 
-for c in contours:
-    # Find bounding box coordinates
+# Collect the bounding shapes of all contours into contiguous arrays first,
+# then draw each kind of shape with as few OpenCV calls as possible
+numContours = len(contours)
+rects = np.empty((numContours, 4, 2), np.int32)
+boxes = np.empty((numContours, 4, 2), np.int32)
+centers = np.empty((numContours, 2), np.int32)
+radii = np.empty(numContours, np.int32)
+for i, c in enumerate(contours):
+    # Find bounding box coordinates and store its corners
     x, y, w, h = cv2.boundingRect(c)
-    cv2.rectangle(img = img, pt1 = (x, y), pt2 = (x+w, y+h), color = (0, 255, 0), thickness = 2)
+    rects[i] = [(x, y), (x+w, y), (x+w, y+h), (x, y+h)]
     
-    # Find minimum area rectangle
-    rect = cv2.minAreaRect(c)
-    # Calculate coordinates of the minimum area rectangle
-    box = cv2.boxPoints(rect)
-    # Normalize the coordinates to integers
-    box = np.int64(box)
-    # Draw the contours
-    cv2.drawContours(image = img, contours = [box], contourIdx = 0, color = (0, 0, 255), thickness = 3)
+    # Find minimum area rectangle and calculate its corner coordinates
+    # Round the coordinates to the nearest integers rather than truncating them
+    boxes[i] = np.rint(cv2.boxPoints(cv2.minAreaRect(c)))
     
     # Calculate the center and the radius of minimum enclosing circle
-    (x, y), radius = cv2.minEnclosingCircle(c)
-    # Cast to integers
-    center = (int(x), int(y))
-    radius = int(radius)
-    # Draw the circle
-    image = cv2.circle(img = img, center = center, radius = radius, color = (0, 255, 0), thickness = 2)
+    centers[i], radii[i] = cv2.minEnclosingCircle(c)
+
+# Draw all bounding boxes and all minimum area rectangles, one call each.
+# Shapes are now drawn kind by kind rather than contour by contour, so where
+# the shapes of different contours overlap, they stack in a different order.
+cv2.polylines(img = img, pts = list(rects), isClosed = True, color = (0, 255, 0), thickness = 2)
+cv2.polylines(img = img, pts = list(boxes), isClosed = True, color = (0, 0, 255), thickness = 3)
+
+# OpenCV has no batched circle drawing, but the integer arrays need no per-circle casts
+for center, radius in zip(centers.tolist(), radii.tolist()):
+    cv2.circle(img = img, center = center, radius = radius, color = (0, 255, 0), thickness = 2)
     
 cv2.drawContours(image = img, contours = contours, contourIdx = -1, color = (255, 0, 0), thickness = 1)
 cv2.imshow(winname = "Contours", mat = img)
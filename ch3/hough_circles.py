@@ -4,8 +4,12 @@ import numpy as np
 # Load the image of planets from file
 planets = cv2.imread(filename = "ch3/planet_glow.jpg")
 
+# Wrap the image in a UMat so OpenCV's transparent API can run the preprocessing
+# on an OpenCL device when one is available (and on the CPU otherwise)
+planets_umat = cv2.UMat(planets)
+
 # Convert the image to grayscale since HoughCircles requires a single channel image
-gray_img = cv2.cvtColor(src = planets, code = cv2.COLOR_BGR2GRAY)
+gray_img = cv2.cvtColor(src = planets_umat, code = cv2.COLOR_BGR2GRAY)
 
 # Apply median blur to reduce noise while preserving edges
 # Kernel size of 5 means a 5x5 pixel window is used for filtering
@@ -23,9 +27,10 @@ circles = cv2.HoughCircles(gray_img, cv2.HOUGH_GRADIENT, 1, 120,
                            param1 = 100, param2 = 30, minRadius = 0, maxRadius = 0)
 
 # Convert circle parameters to integers
+# get() copies the result from the UMat back into a NumPy array
 # np.around rounds the floating point values
 # np.uint16 converts to 16-bit unsigned integers
-circles = np.uint16(np.around(circles))
+circles = np.uint16(np.around(circles.get()))
 
 # Draw detected circles on the original image
 for i in circles[0, :]:
@@ -27,11 +27,9 @@ lines = cv2.HoughLinesP(image = edges, rho = 1, theta = np.pi/180.0, threshold =
                        minLineLength = minLineLength, maxLineGap = maxLineGap)
 
 # Draw detected lines on the original image
-# Iterate through each line detected by Hough transform
-for line in lines:
-    for x1, y1, x2, y2 in line:
-        # Draw a green line (0,255,0) with thickness 2 pixels
-        cv2.line(img = img, pt1 = (x1, y1), pt2 = (x2, y2), color = (0, 255, 0), thickness = 2)
+# Reshape the (N, 1, 4) array of segments into N open 2-point polylines so that
+# all lines are drawn in green (0,255,0) with thickness 2 pixels by a single call
+cv2.polylines(img = img, pts = list(lines.reshape(-1, 2, 2)), isClosed = False, color = (0, 255, 0), thickness = 2)
 
 # Display the edge detection result    
 cv2.imshow(winname = "Edges", mat = edges)
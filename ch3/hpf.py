@@ -1,6 +1,5 @@
 import cv2
 import numpy as np
-from scipy import ndimage
 
 # Define a 3x3 kernel for basic edge detection
 kernel_3x3 = np.array([[-1, -1, -1],
@@ -23,16 +22,19 @@ print(f"Shape of 5x5 Kernel: {kernel_5x5.shape}")
 print(f"Shape of input image: {img.shape}")
 
 # Apply the 3x3 kernel to the image using convolution to highlight edges
-k3 = ndimage.convolve(img, kernel_3x3)
+# The kernels are symmetric, so OpenCV's correlation gives the same result as a convolution,
+# and ddepth = -1 saturates the result to the 8-bit range instead of wrapping around
+k3 = cv2.filter2D(img, -1, kernel_3x3)
 # Apply the 5x5 kernel to the image using convolution to highlight finer edges
-k5 = ndimage.convolve(img, kernel_5x5)
+k5 = cv2.filter2D(img, -1, kernel_5x5)
 
 # Apply Gaussian blurring to smooth the image, which helps in reducing image noise and details
 blurred = cv2.GaussianBlur(img, (17,17), 0)
 
 # Subtract the blurred image from the original image to get a high pass filtered image
 # This process enhances edges by subtracting the low-frequency areas (smoothed by Gaussian blurring)
-g_hpf = img - blurred 
+# cv2.subtract saturates at 0, whereas `img - blurred` on uint8 arrays would wrap negative values around to 255
+g_hpf = cv2.subtract(img, blurred)
 
 # Display the original and processed images in separate windows to compare effects
 cv2.imshow("original image", img)